@@ -12,6 +12,8 @@ UI rendering to ui.py. Database helpers live in logic.py.
 
 from __future__ import annotations
 
+from uuid import uuid4
+
 import streamlit as st
 
 import ui            # local
@@ -24,6 +26,13 @@ import logic         # local
 st.set_page_config(page_title="FB Ads Explorer", layout="wide")
 ui.inject_global_css()
 logic.init_db()  # ensure SQLite tables exist
+if not st.session_state.get("_scratch_purged"):
+    logic.db_purge_scratch()  # drop scraped results left behind by old sessions
+    st.session_state["_scratch_purged"] = True
+if "_apify_import" not in st.session_state:
+    # (ok, err) — checked once per session; the sidebar reads it on every rerun
+    _ApifyClient, _import_err = logic._import_apify_client()
+    st.session_state["_apify_import"] = (_ApifyClient is not None and _import_err is None, _import_err)
 
 
 # -----------------------------------------------------------------------------
@@ -39,34 +48,8 @@ mode = st.sidebar.radio(
 
 # Main heading (right)
 st.markdown(
-    """
-    <style>
-    .custom-title {
-        text-align: center;
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #2d3a4a;
-        margin-top: 1.5rem;
-        margin-bottom: 0.5rem;
-        background: none !important;
-        box-shadow: none !important;
-        border-radius: 0 !important;
-        padding: 0 !important;
-    }
-    .custom-subtitle {
-        text-align: center;
-        font-size: 1.3rem;
-        color: #4e6fae;
-        margin-bottom: 2rem;
-        background: none !important;
-        box-shadow: none !important;
-        border-radius: 0 !important;
-        padding: 0 !important;
-    }
-    </style>
-    <div class="custom-title">Facebook Ad Analytics</div>
-    <div class="custom-subtitle">by PixelPay Media</div>
-    """,
+    '<div class="custom-title">Facebook Ad Analytics</div>'
+    '<div class="custom-subtitle">by PixelPay Media</div>',
     unsafe_allow_html=True,
 )
 
@@ -104,25 +87,37 @@ if mode == "Search Ads":
         st.session_state["last_query_url"] = url
         st.session_state["last_query_params"] = filters
 
+        # Scraped items live in SQLite (scratch_ads); session_state only keeps the run id.
+        run_id = uuid4().hex
         with st.spinner("Running Apify scrape…"):
             try:
-                items = logic.run_apify_scrape(
+                total = logic.run_apify_scrape_to_sqlite(
                     apify_token,
                     url,
                     int(filters["count"]),
                     filters["active_status_param"],
+                    run_id,
                 )
             except Exception as e:  # noqa: BLE001
+                logic.db_delete_scratch(run_id)
                 st.error(f"Apify scrape failed: {e}")
                 st.stop()
 
-        st.session_state["ads_items"] = items
+        prev_run_id = st.session_state.get("ads_run_id")
+        if prev_run_id:
+            logic.db_delete_scratch(prev_run_id)
+        st.session_state["ads_run_id"] = run_id
+        st.session_state["ads_count"] = total
         st.session_state.pop("selected_ad_idx", None)
         st.session_state.pop("save_pending_idx", None)
+        st.session_state.pop("search_page", None)
 
     params = st.session_state.get("last_query_params")
-    ads_items = st.session_state.get("ads_items", [])
-    ui.render_main_search_page(ads_items, params)
+    ui.render_main_search_page(
+        st.session_state.get("ads_run_id"),
+        st.session_state.get("ads_count", 0),
+        params,
+    )
 
 # -----------------------------------------------------------------------------
 # SAVED MODE
@@ -130,8 +125,7 @@ if mode == "Search Ads":
 else:
     team_choice = ui.render_sidebar_saved_mode()
     if team_choice:
-        rows = logic.db_fetch_team(team_choice)
-        ui.render_saved_ads_page(team_choice, rows)
+        ui.render_saved_ads_page(team_choice, logic.db_count_team(team_choice))
     else:
         st.info("Select a team from the sidebar to view saved ads.")
 
@@ -5,14 +5,21 @@ logic.py — Data + DB utilities for FB Ads Explorer (SQLite Teams).
 from __future__ import annotations
 
 import os
-import json
+import re
+import time
+import zlib
 import sqlite3
+import hashlib
+import threading
 from pathlib import Path
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from functools import lru_cache
+from operator import attrgetter
 from urllib.parse import quote_plus
-from typing import Any
+from typing import Any, NamedTuple
 
+import orjson
 import streamlit as st
 import pandas as pd
 
@@ -50,12 +57,28 @@ COMMON_COUNTRIES: list[tuple[str, str]] = [
     ("Brazil", "BR"),
     ("Singapore", "SG"),
 ]
+COMMON_COUNTRY_MAP: dict[str, str] = dict(COMMON_COUNTRIES)
+
+# Widget option tuples (built once, not on every rerun)
+COUNTRY_LABELS: tuple[str, ...] = tuple(n for n, _ in COMMON_COUNTRIES) + ("Custom…",)
+CATEGORY_LABELS: tuple[str, ...] = tuple(CATEGORY_LABEL_TO_ADTYPE)
+ACTIVE_STATUS_LABELS: tuple[str, ...] = tuple(ACTIVE_STATUS_LABEL_TO_PARAM)
+SEARCH_MODE_LABELS: tuple[str, ...] = tuple(SEARCH_MODE_LABEL_TO_PARAM)
 
 TEAM_TABLES = ["team1", "team2", "team3"]
 
 # SQLite path (same folder as this file)
 DB_PATH = Path(__file__).with_name("ads.db")
 
+# How long a cached Apify result stays valid (seconds)
+SCRAPE_CACHE_TTL = 24 * 60 * 60
+
+# Rows per executemany when streaming scraped items into scratch_ads
+SCRATCH_BATCH_SIZE = 500
+
+# Scratch rows older than this (seconds) are purged on session start
+SCRATCH_TTL = 24 * 60 * 60
+
 
 # =============================================================================
 # APIFY IMPORT (lazy)
@@ -69,6 +92,13 @@ def _import_apify_client():
         return None, e
 
 
+@st.cache_resource(show_spinner=False)
+def _get_apify_client(token: str):
+    """One ApifyClient (and its HTTP connection pool) per token, shared across reruns."""
+    ApifyClient, _ = _import_apify_client()
+    return ApifyClient(token)
+
+
 # =============================================================================
 # TOKEN HANDLING
 # =============================================================================
@@ -111,17 +141,58 @@ def build_fb_ads_library_url(*, country: str, keyword: str, ad_type: str, active
 
 
 # =============================================================================
-# APIFY SCRAPE (cached)
+# APIFY SCRAPE (cached in SQLite scrape_cache)
 # =============================================================================
-@st.cache_data(show_spinner=False)
-def run_apify_scrape(token: str, url: str, count: int, active_status: str) -> list[dict]:
+def scrape_cache_key(url: str, count: int, active_status: str) -> str:
+    return hashlib.blake2b(f"{url}|{int(count)}|{active_status}".encode(), digest_size=16).hexdigest()
+
+
+def scrape_cache_get(key: str, ttl: int = SCRAPE_CACHE_TTL) -> list[dict] | None:
+    conn = _get_conn()
+    with _LOCK:
+        row = conn.execute("SELECT ts, payload FROM scrape_cache WHERE url_hash = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    ts, payload = row
+    if time.time() - ts > ttl:
+        return None
+    try:
+        return orjson.loads(zlib.decompress(payload))
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def scrape_cache_put(key: str, items: list[dict]) -> None:
+    _scrape_cache_store(key, zlib.compress(orjson.dumps(items), 3))
+
+
+def _scrape_cache_store(key: str, payload: bytes) -> None:
+    """Store an already zlib-compressed JSON array; expired entries are dropped on the way."""
+    now = time.time()
+    conn = _get_conn()
+    with _LOCK:
+        try:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM scrape_cache WHERE ts < ?", (now - SCRAPE_CACHE_TTL,))
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache (url_hash, ts, payload) VALUES (?, ?, ?)",
+                (key, now, payload),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def _start_apify_run(token: str, url: str, count: int, active_status: str):
+    """Run the scraper actor; returns (client, dataset_id or None)."""
     ApifyClient, import_err = _import_apify_client()
     if import_err or ApifyClient is None:
         raise RuntimeError("apify-client not installed. Run: `pip install apify-client`.")
     if not token:
         raise ValueError("Missing Apify API token.")
 
-    client = ApifyClient(token)
+    client = _get_apify_client(token)
     run_input = {
         "urls": [{"url": url}],
         "count": int(count),
@@ -129,35 +200,107 @@ def run_apify_scrape(token: str, url: str, count: int, active_status: str) -> li
         "period": "",
     }
     run = client.actor("curious_coder/facebook-ads-library-scraper").call(run_input=run_input)
-    ds_id = run.get("defaultDatasetId")
+    return client, run.get("defaultDatasetId")
+
+
+def run_apify_scrape(token: str, url: str, count: int, active_status: str) -> list[dict]:
+    """
+    Scrape ads for url, served from scrape_cache when fresh. The cache key
+    leaves out the token since it does not change the result.
+    """
+    cache_key = scrape_cache_key(url, count, active_status)
+    cached = scrape_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    client, ds_id = _start_apify_run(token, url, count, active_status)
     if not ds_id:
         return []
     items = list(client.dataset(ds_id).iterate_items())
+    scrape_cache_put(cache_key, items)
     return items
 
 
+def run_apify_scrape_to_sqlite(
+    token: str,
+    url: str,
+    count: int,
+    active_status: str,
+    run_id: str,
+    batch_size: int = SCRATCH_BATCH_SIZE,
+) -> int:
+    """
+    Like run_apify_scrape, but streams dataset items into scratch_ads under
+    run_id in batches instead of building a list. Returns the item count.
+    Page through the result with db_fetch_scratch().
+    """
+    cache_key = scrape_cache_key(url, count, active_status)
+    cached = scrape_cache_get(cache_key)
+    if cached is not None:
+        return db_insert_scratch(run_id, cached)
+
+    client, ds_id = _start_apify_run(token, url, count, active_status)
+    if not ds_id:
+        return 0
+
+    # The scrape cache payload is compressed alongside the batches, so only the
+    # compressed output is held — never the whole result as raw JSON.
+    comp = zlib.compressobj(3)
+    chunks = [comp.compress(b"[")]
+    total = 0
+    buf: list[tuple] = []
+    for it in client.dataset(ds_id).iterate_items():
+        blob = orjson.dumps(it)
+        if total:
+            chunks.append(comp.compress(b","))
+        chunks.append(comp.compress(blob))
+        buf.append((run_id, total, blob))
+        total += 1
+        if len(buf) >= batch_size:
+            _scratch_write(buf)
+            buf.clear()
+    if buf:
+        _scratch_write(buf)
+
+    chunks.append(comp.compress(b"]"))
+    chunks.append(comp.flush())
+    _scrape_cache_store(cache_key, b"".join(chunks))
+    return total
+
+
 # =============================================================================
 # DATE HELPERS
 # =============================================================================
+# Lenient fallback for strings fromisoformat rejects (e.g. nanosecond fractions,
+# or "2024-1-5" without leading zeros, which strptime's %m/%d used to accept)
+_DATE_PREFIX_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ](\d{1,2}):(\d{1,2}):(\d{1,2}))?")
+
+
 def parse_date_maybe(s: Any):
     if not s:
         return None
-    for fmt in (
-        "%Y-%m-%d",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-    ):
+    return _parse_date_str(str(s))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(s: str) -> datetime | None:
+    if s.isdigit():  # epoch seconds
         try:
-            return datetime.strptime(str(s), fmt)
-        except Exception:  # noqa: BLE001
-            continue
-    try:  # epoch?
-        if str(s).isdigit():
             return datetime.fromtimestamp(int(s), tz=timezone.utc)
-    except Exception:  # noqa: BLE001
+        except (OverflowError, OSError, ValueError):
+            return None
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
         pass
+    m = _DATE_PREFIX_RE.match(s)
+    if m:
+        try:
+            return datetime(*(int(g) for g in m.groups() if g is not None))
+        except ValueError:
+            return None
     return None
 
 
@@ -190,32 +333,49 @@ def detect_status(item: dict) -> str:
 # =============================================================================
 # SNAPSHOT / MEDIA HELPERS
 # =============================================================================
+_IMAGE_URL_KEYS = ("original_image_url", "original_picture_url", "original_picture", "url", "src")
+_MEDIA_IMG_KEYS = ("imageUrl", "image_url", "thumbnailUrl", "thumbnail_url", "image")
+_MEDIA_VID_KEYS = ("videoUrl", "video_url", "video")
+
+
 def _get_snapshot_dict(item: dict) -> dict:
     snap = item.get("snapshot")
-    if isinstance(snap, str):
+    if type(snap) is dict:
+        return snap
+    if type(snap) is str:
         try:
-            snap = json.loads(snap)
-        except Exception:  # noqa: BLE001
-            snap = {}
-    if not isinstance(snap, dict):
-        snap = {}
-    return snap
+            snap = orjson.loads(snap)
+        except orjson.JSONDecodeError:
+            return {}
+        if type(snap) is dict:
+            return snap
+    return {}
 
 
 def get_original_image_url(item: dict) -> str | None:
-    snap = _get_snapshot_dict(item)
-    imgs = snap.get("images")
-    if isinstance(imgs, dict):
-        imgs = [imgs]
-    elif not isinstance(imgs, (list, tuple)):
-        imgs = []
-    for im in imgs:
-        if not isinstance(im, dict):
-            continue
-        for k in ("original_image_url", "original_picture_url", "original_picture", "url", "src"):
-            v = im.get(k)
-            if v:
-                return v
+    return _get_original_image_url_from_snap(_get_snapshot_dict(item))
+
+
+def _get_original_image_url_from_snap(snap: dict) -> str | None:
+    return _image_url_from_images(snap.get("images"))
+
+
+def _image_url_from_images(imgs: Any) -> str | None:
+    if not imgs or type(imgs) is str:
+        return None
+    if type(imgs) is dict:
+        imgs = (imgs,)
+    try:
+        for im in imgs:
+            try:
+                for k in _IMAGE_URL_KEYS:
+                    v = im.get(k)
+                    if v:
+                        return v
+            except AttributeError:  # not a dict
+                continue
+    except TypeError:  # not iterable
+        pass
     return None
 
 
@@ -223,29 +383,41 @@ def extract_primary_media(item: dict):
     oi = get_original_image_url(item)
     if oi:
         return "image", oi
-    img_keys = ["imageUrl", "image_url", "thumbnailUrl", "thumbnail_url", "image"]
-    vid_keys = ["videoUrl", "video_url", "video"]
-    for k in img_keys:
-        if item.get(k):
-            return "image", item[k]
-    for k in vid_keys:
-        if item.get(k):
-            return "video", item[k]
-    creatives = item.get("creatives") or item.get("media") or []
-    if isinstance(creatives, dict):
-        creatives = [creatives]
-    if isinstance(creatives, (list, tuple)):
-        for c in creatives:
-            if not isinstance(c, dict):
-                continue
-            for k in img_keys:
-                if c.get(k):
-                    return "image", c[k]
-            for k in vid_keys:
-                if c.get(k):
-                    return "video", c[k]
-    media_urls = item.get("mediaUrls") or item.get("media_urls")
-    if isinstance(media_urls, (list, tuple)) and media_urls:
+    return _item_media(item)
+
+
+def _item_media(item: dict):
+    """extract_primary_media minus the snapshot image (top-level keys, creatives, mediaUrls)."""
+    get = item.get
+    for k in _MEDIA_IMG_KEYS:
+        v = get(k)
+        if v:
+            return "image", v
+    for k in _MEDIA_VID_KEYS:
+        v = get(k)
+        if v:
+            return "video", v
+    creatives = get("creatives") or get("media")
+    if creatives and type(creatives) is not str:
+        if type(creatives) is dict:
+            creatives = (creatives,)
+        try:
+            for c in creatives:
+                try:
+                    for k in _MEDIA_IMG_KEYS:
+                        v = c.get(k)
+                        if v:
+                            return "image", v
+                    for k in _MEDIA_VID_KEYS:
+                        v = c.get(k)
+                        if v:
+                            return "video", v
+                except AttributeError:  # not a dict
+                    continue
+        except TypeError:  # not iterable
+            pass
+    media_urls = get("mediaUrls") or get("media_urls")
+    if media_urls and type(media_urls) in (list, tuple):
         return "image", media_urls[0]
     return None, None
 
@@ -285,180 +457,494 @@ CREATE TABLE IF NOT EXISTS {table_name} (
     state_media_run_label TEXT,
     total_active_time INTEGER,
     original_image_url TEXT,
-    raw_json TEXT,
+    raw_json BLOB,  -- zlib-compressed JSON (see _encode_raw_json)
     saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 """
 
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS {table_name}_saved_at_idx ON {table_name}(saved_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS {table_name}_archive_id_idx ON {table_name}(ad_archive_id);
+"""
 
-def _connect() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH)
+SCRAPE_CACHE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS scrape_cache (
+    url_hash TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+"""
 
+SCRATCH_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS scratch_ads (
+    run_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    json BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, idx)
+);
+"""
 
-def init_db() -> None:
-    conn = _connect()
+
+_CONN: sqlite3.Connection | None = None
+_LOCK = threading.Lock()
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+)
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Lazily open the process-wide SQLite connection (shared across Streamlit
+    sessions/threads; writes are serialized with _LOCK).
+    """
+    global _CONN
+    if _CONN is None:
+        with _LOCK:
+            if _CONN is None:
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                for pragma in _PRAGMAS:
+                    conn.execute(pragma)
+                _CONN = conn
+    return _CONN
+
+
+def _encode_raw_json(raw_item: dict) -> bytes:
+    return zlib.compress(orjson.dumps(raw_item), 3)
+
+
+def _decode_raw_json(raw: Any) -> Any:
+    if isinstance(raw, bytes):
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            pass  # uncompressed JSON written before raw_json was compressed
+    return orjson.loads(raw)
+
+
+def _migrate_raw_json_blob(cur: sqlite3.Cursor, table: str) -> None:
+    """
+    Rebuild a team table created with raw_json TEXT so the column is a
+    compressed BLOB. SQLite cannot change a column type in place, so:
+    rename -> create -> copy (re-encoding raw_json) -> drop.
+    """
+    col_types = {r[1]: r[2] for r in cur.execute(f"PRAGMA table_info({table})")}
+    if col_types.get("raw_json", "BLOB").upper() == "BLOB":
+        return
+    old = f"{table}__old"
+    cur.execute("BEGIN")
     try:
+        cur.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        cur.execute(SCHEMA_SQL.format(table_name=table))
+        rows = cur.execute(f"SELECT * FROM {old}").fetchall()
+        if rows:
+            cols = rows[0].keys()
+            raw_pos = cols.index("raw_json")
+            vals = []
+            for r in rows:
+                r = list(r)
+                if r[raw_pos]:
+                    try:
+                        r[raw_pos] = _encode_raw_json(_decode_raw_json(r[raw_pos]))
+                    except Exception:  # noqa: BLE001
+                        r[raw_pos] = None
+                vals.append(r)
+            cur.executemany(
+                f"INSERT INTO {table} ({','.join(cols)}) VALUES ({','.join(['?'] * len(cols))})",
+                vals,
+            )
+        cur.execute(f"DROP TABLE {old}")
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+
+
+def init_db() -> None:
+    conn = _get_conn()
+    with _LOCK:
         cur = conn.cursor()
         for t in TEAM_TABLES:
             cur.execute(SCHEMA_SQL.format(table_name=t))
+            _migrate_raw_json_blob(cur, t)
+            for stmt in INDEX_SQL.format(table_name=t).strip().splitlines():
+                cur.execute(stmt)
+        cur.execute(SCRAPE_CACHE_SCHEMA_SQL)
+        cur.execute(SCRATCH_SCHEMA_SQL)
         conn.commit()
-    finally:
-        conn.close()
 
 
-def db_insert_team(table: str, ad_fields: dict, raw_item: dict | None = None) -> None:
+_TEAM_INSERT_COLS = [
+    "ad_archive_id", "categories", "collation_count", "collation_id",
+    "start_date", "end_date", "entity_type", "is_active",
+    "page_id", "page_name", "cta_text", "cta_type",
+    "link_url", "page_entity_type", "page_profile_picture_url",
+    "page_profile_uri", "state_media_run_label", "total_active_time",
+    "original_image_url", "raw_json",
+]
+_TEAM_INSERT_PH = ",".join(["?"] * len(_TEAM_INSERT_COLS))
+_INSERT_SQL = {
+    t: f"INSERT INTO {t} ({','.join(_TEAM_INSERT_COLS)}) VALUES ({_TEAM_INSERT_PH})"
+    for t in TEAM_TABLES
+}
+
+
+_TEAM_FIELD_COLS = tuple(c for c in _TEAM_INSERT_COLS if c != "raw_json")
+_team_field_values = attrgetter(*_TEAM_FIELD_COLS)  # RenderFields -> values by column name
+_IS_ACTIVE_POS = _TEAM_FIELD_COLS.index("is_active")
+
+
+def _team_row_values(ad_fields: RenderFields | dict, raw_item: dict | None) -> tuple:
+    if type(ad_fields) is RenderFields:
+        vals = list(_team_field_values(ad_fields))
+    else:
+        vals = [ad_fields.get(c) for c in _TEAM_FIELD_COLS]
+    is_active = vals[_IS_ACTIVE_POS]
+    vals[_IS_ACTIVE_POS] = int(bool(is_active)) if is_active is not None else None
+    vals.append(_encode_raw_json(raw_item) if raw_item is not None else None)
+    return tuple(vals)
+
+
+def db_insert_team_many(table: str, ad_fields_list: list[RenderFields | dict], raw_items_list: list[dict | None] | None = None) -> int:
+    """
+    Insert many ads in one transaction (single commit, executemany).
+    Returns the number of rows written.
+    """
+    sql = _INSERT_SQL.get(table)
+    if sql is None:
+        raise ValueError(f"Invalid team table: {table}")
+    if raw_items_list is None:
+        raw_items_list = [None] * len(ad_fields_list)
+    if len(raw_items_list) != len(ad_fields_list):
+        raise ValueError("ad_fields_list and raw_items_list must have the same length")
+    vals_iter = [_team_row_values(ad, raw) for ad, raw in zip(ad_fields_list, raw_items_list)]
+    if not vals_iter:
+        return 0
+    conn = _get_conn()
+    with _LOCK:
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(sql, vals_iter)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return len(vals_iter)
+
+
+def db_insert_team(table: str, ad_fields: RenderFields | dict, raw_item: dict | None = None) -> None:
+    db_insert_team_many(table, [ad_fields], [raw_item])
+
+
+def db_count_team(table: str) -> int:
     if table not in TEAM_TABLES:
         raise ValueError(f"Invalid team table: {table}")
-    cols = [
-        "ad_archive_id", "categories", "collation_count", "collation_id",
-        "start_date", "end_date", "entity_type", "is_active",
-        "page_id", "page_name", "cta_text", "cta_type",
-        "link_url", "page_entity_type", "page_profile_picture_url",
-        "page_profile_uri", "state_media_run_label", "total_active_time",
-        "original_image_url", "raw_json",
-    ]
-    vals = [
-        ad_fields.get("ad_archive_id"),
-        ad_fields.get("categories"),
-        ad_fields.get("collation_count"),
-        ad_fields.get("collation_id"),
-        ad_fields.get("start_date"),
-        ad_fields.get("end_date"),
-        ad_fields.get("entity_type"),
-        int(bool(ad_fields.get("is_active"))) if ad_fields.get("is_active") is not None else None,
-        ad_fields.get("page_id"),
-        ad_fields.get("page_name"),
-        ad_fields.get("cta_text"),
-        ad_fields.get("cta_type"),
-        ad_fields.get("link_url"),
-        ad_fields.get("page_entity_type"),
-        ad_fields.get("page_profile_picture_url"),
-        ad_fields.get("page_profile_uri"),
-        ad_fields.get("state_media_run_label"),
-        ad_fields.get("total_active_time"),
-        ad_fields.get("original_image_url"),
-        json.dumps(raw_item, ensure_ascii=False) if raw_item is not None else None,
-    ]
-    ph = ",".join(["?"] * len(cols))
-    sql = f"INSERT INTO {table} ({','.join(cols)}) VALUES ({ph})"
-    conn = _connect()
-    try:
-        conn.execute(sql, vals)
-        conn.commit()
-    finally:
-        conn.close()
+    conn = _get_conn()
+    with _LOCK:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
 
 
-def db_fetch_team(table: str) -> list[dict]:
+def db_fetch_team(table: str, limit: int | None = None, offset: int = 0) -> list[dict]:
+    """Newest first; pass limit/offset to fetch one page."""
     if table not in TEAM_TABLES:
         raise ValueError(f"Invalid team table: {table}")
-    conn = _connect()
-    try:
+    conn = _get_conn()
+    with _LOCK:
         cur = conn.cursor()
-        cur.execute(f"SELECT * FROM {table} ORDER BY saved_at DESC")
+        cur.execute(
+            f"SELECT * FROM {table} ORDER BY saved_at DESC, id DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else int(limit), int(offset)),
+        )
         rows = cur.fetchall()
-        cols = [c[0] for c in cur.description]
-    finally:
-        conn.close()
     results: list[dict] = []
     for r in rows:
-        d = dict(zip(cols, r))
+        d = dict(r)
         raw = d.get("raw_json")
         if raw:
             try:
-                d["raw_json"] = json.loads(raw)
+                d["raw_json"] = _decode_raw_json(raw)
             except Exception:  # noqa: BLE001
                 pass
         results.append(d)
     return results
 
 
+# =============================================================================
+# SCRATCH (staging for scraped items, keyed by run_id)
+# =============================================================================
+def _scratch_write(rows: list[tuple]) -> None:
+    conn = _get_conn()
+    with _LOCK:
+        try:
+            conn.execute("BEGIN")
+            conn.executemany("INSERT OR REPLACE INTO scratch_ads (run_id, idx, json) VALUES (?, ?, ?)", rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def db_insert_scratch(run_id: str, items: list[dict], batch_size: int = SCRATCH_BATCH_SIZE) -> int:
+    for start in range(0, len(items), batch_size):
+        _scratch_write([
+            (run_id, start + i, orjson.dumps(it))
+            for i, it in enumerate(items[start:start + batch_size])
+        ])
+    return len(items)
+
+
+def db_get_scratch_item(run_id: str, idx: int) -> dict | None:
+    conn = _get_conn()
+    with _LOCK:
+        row = conn.execute("SELECT json FROM scratch_ads WHERE run_id = ? AND idx = ?", (run_id, int(idx))).fetchone()
+    return orjson.loads(row[0]) if row else None
+
+
+def db_delete_scratch(run_id: str) -> None:
+    conn = _get_conn()
+    with _LOCK:
+        try:
+            conn.execute("DELETE FROM scratch_ads WHERE run_id = ?", (run_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def db_purge_scratch(max_age: int = SCRATCH_TTL) -> None:
+    """Drop scratch rows from runs older than max_age seconds (abandoned sessions)."""
+    conn = _get_conn()
+    with _LOCK:
+        try:
+            conn.execute(
+                "DELETE FROM scratch_ads WHERE created_at < datetime('now', ?)",
+                (f"-{int(max_age)} seconds",),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def db_fetch_scratch(run_id: str, limit: int | None = None, offset: int = 0) -> list[dict]:
+    conn = _get_conn()
+    with _LOCK:
+        rows = conn.execute(
+            "SELECT json FROM scratch_ads WHERE run_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+            (run_id, -1 if limit is None else int(limit), int(offset)),
+        ).fetchall()
+    return [orjson.loads(r[0]) for r in rows]
+
+
 # =============================================================================
 # EXPORT DF (curated)
 # =============================================================================
+EXPORT_COLUMNS = [
+    "ad_archive_id", "categories", "collation_count", "collation_id",
+    "start_date", "end_date", "entity_type", "is_active",
+    "page_id", "page_name", "cta_text", "cta_type",
+    "link_url", "page_entity_type", "page_profile_picture_url",
+    "page_profile_uri", "state_media_run_label", "total_active_time",
+    "original_image_url", "original_picture_url",
+]
+
+
 def ads_to_dataframe(items: list[dict]) -> pd.DataFrame:
-    rows = [extract_selected_fields(it) for it in items]
-    return pd.DataFrame(rows)
+    """Curated export frame: one extract_selected_fields row per item."""
+    return pd.DataFrame([extract_selected_fields(it)._asdict() for it in items], columns=EXPORT_COLUMNS)
+
+
+# =============================================================================
+# SAVED ROW ITEM (legacy rows without raw_json)
+# =============================================================================
+@dataclass(slots=True, frozen=True)
+class AdItem:
+    """Flat, read-only view of a saved team row; stands in for a scraped item dict."""
+
+    ad_archive_id: str | None = None
+    categories: str | None = None
+    collation_count: str | None = None
+    collation_id: str | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+    entity_type: str | None = None
+    is_active: bool = False
+    page_id: str | None = None
+    page_name: str | None = None
+    cta_text: str | None = None
+    cta_type: str | None = None
+    link_url: str | None = None
+    page_entity_type: str | None = None
+    page_profile_picture_url: str | None = None
+    page_profile_uri: str | None = None
+    state_media_run_label: str | None = None
+    total_active_time: int | None = None
+    original_image_url: str | None = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> AdItem:
+        kw = {k: row.get(k) for k in _AD_ITEM_FIELDS}
+        kw["is_active"] = bool(kw["is_active"])
+        return cls(**kw)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get shim so the item helpers (detect_status, extract_primary_media, …) accept it."""
+        if key in _AD_ITEM_FIELDS:
+            return getattr(self, key)
+        if key == "snapshot":
+            return self.snapshot()
+        return default
+
+    def snapshot(self) -> dict:
+        """Minimal scraped-style snapshot, built only when a helper asks for it."""
+        return {
+            "link_url": self.link_url,
+            "cards": {"cta_text": self.cta_text, "cta_type": self.cta_type, "link_url": self.link_url},
+            "page_categories": {"page_entity_type": self.page_entity_type},
+            "images": {"original_image_url": self.original_image_url},
+            "page_profile_picture_url": self.page_profile_picture_url,
+            "page_profile_uri": self.page_profile_uri,
+        }
+
+
+_AD_ITEM_FIELDS = frozenset(f.name for f in fields(AdItem))
+
+
+def _ad_item_selected_fields(a: AdItem) -> RenderFields:
+    """extract_selected_fields for an AdItem: columns are already flat, no snapshot walk."""
+    image_url = a.original_image_url or None
+    return RenderFields(
+        ad_archive_id=a.ad_archive_id or None,
+        categories=a.categories,
+        collation_count=a.collation_count,
+        collation_id=a.collation_id,
+        start_date=_coerce_epoch_or_date(a.start_date),
+        end_date=_coerce_epoch_or_date(a.end_date),
+        entity_type=a.entity_type,
+        is_active=a.is_active,
+        page_id=a.page_id or None,
+        page_name=a.page_name or None,
+        cta_text=a.cta_text or None,
+        cta_type=a.cta_type or None,
+        link_url=a.link_url or None,
+        page_entity_type=a.page_entity_type or None,
+        page_profile_picture_url=a.page_profile_picture_url,
+        page_profile_uri=a.page_profile_uri,
+        state_media_run_label=a.state_media_run_label,
+        total_active_time=a.total_active_time,
+        original_image_url=image_url,
+        original_picture_url=image_url,  # backward compat
+        media_type="image" if image_url else None,
+        media_url=image_url,
+    )
 
 
 # =============================================================================
 # CURATED FIELD EXTRACTION
 # =============================================================================
-def extract_selected_fields(item: dict) -> dict:
+class RenderFields(NamedTuple):
+    """Curated per-ad fields (attribute access; _asdict() for JSON views)."""
+
+    ad_archive_id: Any = None
+    categories: Any = None
+    collation_count: Any = None
+    collation_id: Any = None
+    start_date: str | None = None
+    end_date: str | None = None
+    entity_type: Any = None
+    is_active: Any = None
+    page_id: Any = None
+    page_name: Any = None
+    cta_text: Any = None
+    cta_type: Any = None
+    link_url: Any = None
+    page_entity_type: Any = None
+    page_profile_picture_url: Any = None
+    page_profile_uri: Any = None
+    state_media_run_label: Any = None
+    total_active_time: Any = None
+    original_image_url: str | None = None
+    original_picture_url: str | None = None  # backward compat
+    media_type: str | None = None  # "image" / "video" / None, per extract_primary_media
+    media_url: str | None = None
+
+
+def _coerce_epoch_or_date(val):
+    """Coerce epoch seconds or a date string to 'YYYY-MM-DD' (None if unparseable)."""
+    if val in (None, "", 0, "0"):
+        return None
+    try:
+        if isinstance(val, (int, float)) or str(val).isdigit():
+            dt = datetime.fromtimestamp(int(val), tz=timezone.utc)
+            return dt.date().isoformat()
+    except Exception:  # noqa: BLE001
+        pass
+    dt = parse_date_maybe(val)
+    if dt:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.date().isoformat()
+    return None
+
+
+_EMPTY: dict = {}
+
+
+def _first_dict_of(v: Any) -> dict | None:
+    """cards/page_categories come as a list of dicts or a single dict."""
+    if type(v) is list:
+        return v[0] if v and type(v[0]) is dict else None
+    if type(v) is dict:
+        return v
+    return None
+
+
+def extract_selected_fields(item: dict | AdItem) -> RenderFields:
     """
     Extract curated fields safely (handles lists / strings / missing / snapshot JSON).
+    Also accepts an AdItem (saved row).
     """
+    if type(item) is AdItem:
+        return _ad_item_selected_fields(item)
+    get = item.get
     snap = _get_snapshot_dict(item)
+    sget = snap.get
+    cget = (_first_dict_of(sget("cards")) or _EMPTY).get
+    pgcat_get = (_first_dict_of(sget("page_categories")) or _EMPTY).get
 
-    # cards
-    card0 = None
-    cards = snap.get("cards")
-    if isinstance(cards, list) and cards:
-        if isinstance(cards[0], dict):
-            card0 = cards[0]
-    elif isinstance(cards, dict):
-        card0 = cards
-
-    # page_categories
-    pgcat0 = None
-    page_categories = snap.get("page_categories")
-    if isinstance(page_categories, list) and page_categories:
-        if isinstance(page_categories[0], dict):
-            pgcat0 = page_categories[0]
-    elif isinstance(page_categories, dict):
-        pgcat0 = page_categories
-
-    # link_url
-    link_url = snap.get("link_url")
-    if not link_url and isinstance(card0, dict):
-        link_url = card0.get("link_url")
-
-    # coerce date (epoch OK)
-    def _coerce_epoch_or_date(val):
-        if val in (None, "", 0, "0"):
-            return None
-        try:
-            if isinstance(val, (int, float)) or str(val).isdigit():
-                dt = datetime.fromtimestamp(int(val), tz=timezone.utc)
-                return dt.date().isoformat()
-        except Exception:  # noqa: BLE001
-            pass
-        dt = parse_date_maybe(val)
-        if dt:
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.date().isoformat()
-        return None
-
-    start_date = _coerce_epoch_or_date(item.get("start_date") or item.get("startDate"))
-    end_date = _coerce_epoch_or_date(item.get("end_date") or item.get("endDate"))
-
-    # categories display
-    categories = item.get("categories")
+    categories = get("categories")
     if isinstance(categories, (list, tuple)):
-        categories_disp = ", ".join(str(c) for c in categories)
-    else:
-        categories_disp = categories
-
-    return {
-        "ad_archive_id": item.get("ad_archive_id") or item.get("adId"),
-        "categories": categories_disp,
-        "collation_count": item.get("collation_count"),
-        "collation_id": item.get("collation_id"),
-        "start_date": start_date,
-        "end_date": end_date,
-        "entity_type": item.get("entity_type"),
-        "is_active": item.get("is_active"),
-        "page_id": item.get("page_id") or item.get("pageId"),
-        "page_name": item.get("page_name") or item.get("pageName"),
-        "cta_text": (card0.get("cta_text") if isinstance(card0, dict) else None) or snap.get("cta_text"),
-        "cta_type": (card0.get("cta_type") if isinstance(card0, dict) else None) or snap.get("cta_type"),
-        "link_url": link_url,
-        "page_entity_type": (pgcat0.get("page_entity_type") if isinstance(pgcat0, dict) else None) or item.get("page_entity_type"),
-        "page_profile_picture_url": item.get("page_profile_picture_url") or snap.get("page_profile_picture_url"),
-        "page_profile_uri": item.get("page_profile_uri") or snap.get("page_profile_uri"),
-        "state_media_run_label": item.get("state_media_run_label"),
-        "total_active_time": item.get("total_active_time"),
-        "original_image_url": get_original_image_url(item),
-        "original_picture_url": get_original_image_url(item),  # backward compat
-    }
+        categories = ", ".join(str(c) for c in categories)
+
+    original_image_url = _get_original_image_url_from_snap(snap)
+    media_type, media_url = ("image", original_image_url) if original_image_url else _item_media(item)
+
+    return RenderFields(
+        ad_archive_id=get("ad_archive_id") or get("adId"),
+        categories=categories,
+        collation_count=get("collation_count"),
+        collation_id=get("collation_id"),
+        start_date=_coerce_epoch_or_date(get("start_date") or get("startDate")),
+        end_date=_coerce_epoch_or_date(get("end_date") or get("endDate")),
+        entity_type=get("entity_type"),
+        is_active=get("is_active"),
+        page_id=get("page_id") or get("pageId"),
+        page_name=get("page_name") or get("pageName"),
+        cta_text=cget("cta_text") or sget("cta_text"),
+        cta_type=cget("cta_type") or sget("cta_type"),
+        link_url=sget("link_url") or cget("link_url"),
+        page_entity_type=pgcat_get("page_entity_type") or get("page_entity_type"),
+        page_profile_picture_url=get("page_profile_picture_url") or sget("page_profile_picture_url"),
+        page_profile_uri=get("page_profile_uri") or sget("page_profile_uri"),
+        state_media_run_label=get("state_media_run_label"),
+        total_active_time=get("total_active_time"),
+        original_image_url=original_image_url,
+        original_picture_url=original_image_url,  # backward compat
+        media_type=media_type,
+        media_url=media_url,
+    )
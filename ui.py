@@ -5,13 +5,20 @@ Functions:
   inject_global_css()
   render_sidebar_search()  -> filters, token, fetch_clicked
   render_sidebar_saved_mode() -> team
+  render_card_grid()          -> card columns + buttons
   render_main_search_page()   -> cards + detail
   render_saved_ads_page()     -> cards + detail (from DB)
 """
 
 from __future__ import annotations
 
-import json
+from functools import partial
+from operator import attrgetter
+from html import escape
+from string import Template
+
+import orjson
+import pandas as pd
 import streamlit as st
 
 import logic  # local module
@@ -42,15 +49,27 @@ CUSTOM_CSS = """
 .fb-card-badge-secondary{background:#eef0f3;color:#333;}
 
 /************** Detail Panel **************/
+.fb-detail-media img{width:100%;height:auto;display:block;}
 .fb-detail-table{width:100%;border-collapse:collapse;font-size:0.88rem;}
 .fb-detail-table td{padding:4px 8px;border-bottom:1px solid #eee;vertical-align:top;}
 .fb-detail-table td:first-child{font-weight:600;width:35%;color:#555;}
+
+/************** Page Title **************/
+.custom-title{text-align:center;font-size:2.5rem;font-weight:700;color:#2d3a4a;margin-top:1.5rem;margin-bottom:0.5rem;background:none !important;box-shadow:none !important;border-radius:0 !important;padding:0 !important;}
+.custom-subtitle{text-align:center;font-size:1.3rem;color:#4e6fae;margin-bottom:2rem;background:none !important;box-shadow:none !important;border-radius:0 !important;padding:0 !important;}
 </style>
 """
 
+# Comment/blank-line-free copy, built once at import. Streamlit has to re-emit the
+# <style> element on every rerun (a skipped element is removed from the page), so
+# the rerun cost is kept down by making it the app's only, smallest stylesheet.
+_CSS_MARKUP = "".join(
+    ln.strip() for ln in CUSTOM_CSS.splitlines() if ln.strip() and not ln.strip().startswith("/*")
+)
+
 
 def inject_global_css() -> None:
-    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown(_CSS_MARKUP, unsafe_allow_html=True)
 
 
 # =============================================================================
@@ -60,13 +79,12 @@ def render_sidebar_search():
     st.sidebar.header("Query Parameters")
 
     # Country select
-    country_labels = [n for n, _ in logic.COMMON_COUNTRIES] + ["Custom…"]
-    country_label_sel = st.sidebar.selectbox("Country", options=country_labels, index=0, key="search_country_sel")
+    country_label_sel = st.sidebar.selectbox("Country", options=logic.COUNTRY_LABELS, index=0, key="search_country_sel")
     if country_label_sel == "Custom…":
         country_code = st.sidebar.text_input("ISO country code", value="", key="search_country_custom").strip().upper() or "US"
         country_label = country_code
     else:
-        country_code = dict(logic.COMMON_COUNTRIES)[country_label_sel]
+        country_code = logic.COMMON_COUNTRY_MAP[country_label_sel]
         country_label = country_label_sel
 
     # Keyword input
@@ -74,19 +92,19 @@ def render_sidebar_search():
 
     # Ad Category radio
     ad_category_label = st.sidebar.radio(
-        "Ad category", options=list(logic.CATEGORY_LABEL_TO_ADTYPE.keys()), index=0, key="search_category"
+        "Ad category", options=logic.CATEGORY_LABELS, index=0, key="search_category"
     )
     ad_type_param = logic.CATEGORY_LABEL_TO_ADTYPE[ad_category_label]
 
     # Active status radio
     active_status_label = st.sidebar.radio(
-        "Active status", options=list(logic.ACTIVE_STATUS_LABEL_TO_PARAM.keys()), index=0, key="search_status"
+        "Active status", options=logic.ACTIVE_STATUS_LABELS, index=0, key="search_status"
     )
     active_status_param = logic.ACTIVE_STATUS_LABEL_TO_PARAM[active_status_label]
 
     # Search mode select
     search_mode_label = st.sidebar.selectbox(
-        "Search matching", options=list(logic.SEARCH_MODE_LABEL_TO_PARAM.keys()), index=0, key="search_match"
+        "Search matching", options=logic.SEARCH_MODE_LABELS, index=0, key="search_match"
     )
     search_mode_param = logic.SEARCH_MODE_LABEL_TO_PARAM[search_mode_label]
 
@@ -101,8 +119,8 @@ def render_sidebar_search():
     )
 
     # Install hint if apify-client missing
-    ApifyClient, import_err = logic._import_apify_client()
-    if import_err or ApifyClient is None:
+    apify_ok, _ = st.session_state.get("_apify_import", (True, None))
+    if not apify_ok:
         st.sidebar.warning("`apify-client` not installed. Run: `pip install apify-client`.")
 
     # Final token resolution
@@ -166,21 +184,50 @@ def render_filter_bar(*, country_label: str, ad_category_label: str, keyword: st
 # =============================================================================
 # DETAIL TABLE HTML
 # =============================================================================
-def _make_detail_table_html(rows):
-    cells = []
-    for label, value in rows:
-        val = value if value not in (None, "", [], {}) else "–"
-        cells.append(f"<tr><td>{label}</td><td>{val}</td></tr>")
+_DETAIL_KEYS = (
+    "ad_archive_id", "categories", "collation_count", "collation_id",
+    "start_date", "end_date", "entity_type", "is_active",
+    "page_id", "page_name", "cta_text", "cta_type",
+    "page_entity_type", "page_profile_picture_url", "page_profile_uri",
+    "state_media_run_label", "total_active_time", "original_image_url",
+)
+
+
+_DETAIL_ROW_HEADS = tuple(f"<tr><td>{k}</td><td>" for k in _DETAIL_KEYS)  # label cells built once
+_detail_values = attrgetter(*_DETAIL_KEYS)  # RenderFields -> tuple in _DETAIL_KEYS order
+
+
+def _make_detail_table_html(f: logic.RenderFields) -> str:
+    """Details table; values are HTML-escaped, empty ones shown as "–"."""
+    cells = [
+        head + (escape(str(v)) if v not in (None, "", [], {}) else "–") + "</td></tr>"
+        for head, v in zip(_DETAIL_ROW_HEADS, _detail_values(f))
+    ]
     return f"<table class='fb-detail-table'>{''.join(cells)}</table>"
 
 
+# =============================================================================
+# PAGINATION
+# =============================================================================
+PAGE_SIZE = 30  # cards per page
+
+
+def _page_selector(total: int, *, key: str) -> int:
+    """1-based page number; only shows a selector when there is more than one page."""
+    pages = max(1, -(-total // PAGE_SIZE))
+    if pages == 1:
+        return 1
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    return int(page)
+
+
 # =============================================================================
 # SAVE CARD UI
 # =============================================================================
-def _card_save_ui(idx: int, ad_fields: dict, raw_item: dict):
+def _card_save_ui(idx: int, ad_fields: logic.RenderFields, item: dict):
     table = st.selectbox("Save to team", options=logic.TEAM_TABLES, key=f"save_select_{idx}")
     if st.button("Confirm save", key=f"confirm_save_{idx}"):
-        logic.db_insert_team(table, ad_fields, raw_item)
+        logic.db_insert_team(table, ad_fields, item)
         st.success(f"Saved to {table}!")
         st.session_state.pop("save_pending_idx", None)
 
@@ -188,89 +235,128 @@ def _card_save_ui(idx: int, ad_fields: dict, raw_item: dict):
 # =============================================================================
 # CARD RENDERER (shared)
 # =============================================================================
-def render_ad_card(item: dict, idx: int, variant: str, *, team: str | None = None, raw_item: dict | None = None):
+CARDS_PER_ROW = 3
+
+
+def _ad_text(item: dict) -> str:
+    return item.get("adText") or item.get("ad_text") or item.get("text") or ""
+
+
+def _prepare_card(item: dict, idx: int) -> dict:
+    """
+    Everything the card and detail renderers need for one ad, computed in a
+    single pass so neither has to re-run the logic helpers.
+    """
+    f = logic.extract_selected_fields(item)  # cheaper than any cache key over the raw item
+
+    return {
+        "item": item,
+        "idx": idx,
+        "fields": f,
+        "page_name": f.page_name or item.get("pageName") or "(no page name)",
+        "short_text": logic.summarize_text(_ad_text(item), 200),
+        "ad_id": f.ad_archive_id or item.get("adId") or item.get("id") or f"#{idx}",
+        "status": logic.detect_status(item),
+        "days": logic.compute_running_days(item),
+        "media_type": f.media_type,  # snapshot image first, else extract_primary_media
+        "media_url": f.media_url,
+    }
+
+
+def _prepare_cards(items: list[dict], offset: int) -> list[dict]:
+    """_prepare_card for a page of items."""
+    return [_prepare_card(it, offset + i) for i, it in enumerate(items)]
+
+
+# Off-screen card images don't fetch/decode until scrolled near; width/height reserve the box
+_CARD_IMG_TMPL = Template(
+    "<div class='fb-card-media'><img src='$url' width='600' height='600' "
+    "loading='lazy' decoding='async' fetchpriority='low'/></div>"
+)
+_CARD_VIDEO_TMPL = Template("<div class='fb-card-media'><video src='$url' controls preload='metadata'></video></div>")
+_CARD_TMPL = Template(
+    "<div class='fb-card-wrapper'>$media"
+    "<div class='fb-card'>"
+    "<div class='fb-card-badges'>"
+    "<span class='fb-card-badge'>$status</span>"
+    "<span class='fb-card-badge fb-card-badge-secondary'>${days}D</span>"
+    "</div>"
+    "<div class='fb-card-header'>"
+    "<div class='fb-card-brand'>$page_name</div>"
+    "<div class='fb-card-sub'>Archive ID: $archive</div>"
+    "</div>"
+    "<div class='fb-card-body'>$body</div>"
+    "</div></div>"
+)
+
+
+def _card_html(card: dict) -> str:
+    """HTML for one ad card (media + badges + header + body); all values are HTML-escaped."""
+    media_type, media_url = card["media_type"], card["media_url"]
+    if media_url and media_type == "image":
+        media_html = _CARD_IMG_TMPL.substitute(url=escape(str(media_url)))
+    elif media_url and media_type == "video":
+        media_html = _CARD_VIDEO_TMPL.substitute(url=escape(str(media_url)))
+    else:
+        media_html = ""
+
+    return _CARD_TMPL.substitute(
+        media=media_html,
+        status=escape(str(card["status"])),
+        days=escape(str(card["days"] or "–")),
+        page_name=escape(str(card["page_name"])),
+        archive=escape(str(card["ad_id"])),
+        body=escape(card["short_text"]),
+    )
+
+
+def _card_actions(item: dict, idx: int, f: logic.RenderFields, variant: str, *, team: str | None = None):
     """
-    Render one ad card.
+    Buttons under one card.
 
     variant = "search": show See Ad Details + Save
     variant = "saved":  show See Ad Details only (select saved detail)
     """
-    f = logic.extract_selected_fields(item)
-
-    page_name = f.get("page_name") or item.get("pageName") or "(no page name)"
-    ad_text = item.get("adText") or item.get("ad_text") or item.get("text") or ""
-    short_text = logic.summarize_text(ad_text, 200)
-    ad_archive_id = f.get("ad_archive_id") or item.get("adId") or item.get("id") or f"#{idx}"
-    status = logic.detect_status(item)
-    running_days = logic.compute_running_days(item)
-
-    # Prefer snapshot original image
-    img_from_snapshot = f.get("original_image_url") or f.get("original_picture_url")
-    if img_from_snapshot:
-        media_type, media_url = "image", img_from_snapshot
-    else:
-        media_type, media_url = logic.extract_primary_media(item)
-
-    with st.container():
-        st.markdown("<div class='fb-card-wrapper'>", unsafe_allow_html=True)
-        if media_url:
-            if media_type == "image":
-                st.markdown(
-                    f"<div class='fb-card-media'><img src='{media_url}'/></div>",
-                    unsafe_allow_html=True,
-                )
-            elif media_type == "video":
-                st.video(media_url)
-        st.markdown(
-            f"""
-            <div class='fb-card'>
-                <div class='fb-card-badges'>
-                    <span class='fb-card-badge'>{status}</span>
-                    <span class='fb-card-badge fb-card-badge-secondary'>{running_days or '–'}D</span>
-                </div>
-                <div class='fb-card-header'>
-                    <div class='fb-card-brand'>{page_name}</div>
-                    <div class='fb-card-sub'>Archive ID: {ad_archive_id}</div>
-                </div>
-                <div class='fb-card-body'>{short_text}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    if variant == "search":
+        c1, c2 = st.columns(2)
+        if c1.button("See Ad Details", key=f"detail_{idx}"):
+            st.session_state["selected_ad_idx"] = idx
+        if c2.button("Save", key=f"save_{idx}"):
+            st.session_state["save_pending_idx"] = idx
+        if st.session_state.get("save_pending_idx") == idx:
+            _card_save_ui(idx, f, item)
 
-        if variant == "search":
-            c1, c2 = st.columns(2)
-            if c1.button("See Ad Details", key=f"detail_{idx}"):
-                st.session_state["selected_ad_idx"] = idx
-            if c2.button("Save", key=f"save_{idx}"):
-                st.session_state["save_pending_idx"] = idx
-            if st.session_state.get("save_pending_idx") == idx:
-                _card_save_ui(idx, f, raw_item or item)
+    elif variant == "saved":
+        if st.button("See Ad Details", key=f"saved_detail_{team}_{idx}"):
+            st.session_state[f"saved_selected_idx_{team}"] = idx
 
-        elif variant == "saved":
-            if st.button("See Ad Details", key=f"saved_detail_{team}_{idx}"):
-                st.session_state[f"saved_selected_idx_{team}"] = idx
 
-        st.markdown("</div>", unsafe_allow_html=True)
+def render_card_grid(cards: list[dict], variant: str, *, team: str | None = None):
+    """
+    Render prepared cards (see _prepare_cards) into one st.columns layout
+    created once; card i goes to column i % CARDS_PER_ROW and cards stack
+    vertically within a column, each as one markdown element + its buttons.
+    """
+    cols = st.columns(CARDS_PER_ROW, gap="large")
+    for i, c in enumerate(cards):
+        with cols[i % CARDS_PER_ROW]:
+            st.markdown(_card_html(c), unsafe_allow_html=True)
+            _card_actions(c["item"], c["idx"], c["fields"], variant, team=team)
 
 
 # =============================================================================
-# DETAIL VIEW — SEARCH RESULTS
+# DETAIL VIEW (shared body)
 # =============================================================================
-def render_ad_detail(item: dict):
-    f = logic.extract_selected_fields(item)
-
-    page_name = f.get("page_name") or "(no page name)"
-    ad_archive_id = f.get("ad_archive_id") or "–"
+def _render_detail(card: dict):
+    """Header, media, links and the details table; callers add their own expanders."""
+    f = card["fields"]
 
-    img_from_snapshot = f.get("original_image_url") or f.get("original_picture_url")
-    if img_from_snapshot:
-        media_type, media_url = "image", img_from_snapshot
-    else:
-        media_type, media_url = logic.extract_primary_media(item)
+    page_name = escape(str(f.page_name or "(no page name)"))
+    ad_archive_id = escape(str(f.ad_archive_id or "–"))
+    media_type, media_url = card["media_type"], card["media_url"]
 
-    st.markdown("---")
     st.markdown(
+        "<hr/>"
         f"<h3 style='margin-bottom:0;'>{page_name}</h3>"
         f"<div style='color:#666;font-size:0.9rem;'>Ad Archive ID: {ad_archive_id}</div>",
         unsafe_allow_html=True,
@@ -280,164 +366,97 @@ def render_ad_detail(item: dict):
     with left:
         if media_url:
             if media_type == "image":
-                st.image(media_url, use_column_width=True)
+                st.markdown(
+                    f"<div class='fb-detail-media'><img src='{escape(str(media_url))}' fetchpriority='high' decoding='async'/></div>",
+                    unsafe_allow_html=True,
+                )
             elif media_type == "video":
                 st.video(media_url)
-        if f.get("link_url"):
-            st.markdown(f"[Ad Destination URL]({f['link_url']})")
-        if f.get("page_profile_uri"):
-            st.markdown(f"[Page Profile]({f['page_profile_uri']})")
+        if f.link_url:
+            st.markdown(f"[Ad Destination URL]({f.link_url})")
+        if f.page_profile_uri:
+            st.markdown(f"[Page Profile]({f.page_profile_uri})")
 
     with right:
         st.markdown("### Details")
-        info_rows = [
-            ("ad_archive_id", f.get("ad_archive_id")),
-            ("categories", f.get("categories")),
-            ("collation_count", f.get("collation_count")),
-            ("collation_id", f.get("collation_id")),
-            ("start_date", f.get("start_date")),
-            ("end_date", f.get("end_date")),
-            ("entity_type", f.get("entity_type")),
-            ("is_active", f.get("is_active")),
-            ("page_id", f.get("page_id")),
-            ("page_name", f.get("page_name")),
-            ("cta_text", f.get("cta_text")),
-            ("cta_type", f.get("cta_type")),
-            ("page_entity_type", f.get("page_entity_type")),
-            ("page_profile_picture_url", f.get("page_profile_picture_url")),
-            ("page_profile_uri", f.get("page_profile_uri")),
-            ("state_media_run_label", f.get("state_media_run_label")),
-            ("total_active_time", f.get("total_active_time")),
-            ("original_image_url", f.get("original_image_url")),
-        ]
-        st.markdown(_make_detail_table_html(info_rows), unsafe_allow_html=True)
-
-    with st.expander("All fields (raw JSON)"):
-        st.json(item)
-    with st.expander("Debug: Extracted fields"):
-        st.json(f)
+        st.markdown(_make_detail_table_html(f), unsafe_allow_html=True)
+
+
+# =============================================================================
+# DETAIL VIEW — SEARCH RESULTS
+# =============================================================================
+def _lazy_json(label: str, data, key: str):
+    """Expander whose st.json payload is only sent once the user ticks "Show"."""
+    # Closed expanders still ship their contents; the checkbox keeps large dicts off the wire
+    with st.expander(label):
+        if st.checkbox("Show", key=key):
+            st.json(data)
+
+
+def render_ad_detail(card: dict):
+    _render_detail(card)
+
+    idx, ad_id = card["idx"], card["ad_id"]
+    _lazy_json("All fields (raw JSON)", card["item"], f"exp_raw_{idx}_{ad_id}")
+    _lazy_json("Debug: Extracted fields", card["fields"]._asdict(), f"exp_fields_{idx}_{ad_id}")
 
 
 # =============================================================================
 # BUILD ITEM-LIKE STRUCTURE FROM DB ROW
 # =============================================================================
-def _db_row_to_item(row: dict) -> dict:
+def _db_row_to_item(row: dict) -> dict | logic.AdItem:
     """
-    Convert DB row -> item-like dict for extract_selected_fields/media helpers.
-    Uses raw_json if stored; otherwise constructs minimal snapshot.
+    Convert DB row -> item for extract_selected_fields/media helpers.
+    Uses raw_json if stored; otherwise a slotted logic.AdItem over the row columns.
     """
     if isinstance(row.get("raw_json"), dict):
         return row["raw_json"]
-
-    snap = {
-        "link_url": row.get("link_url"),
-        "cards": {
-            "cta_text": row.get("cta_text"),
-            "cta_type": row.get("cta_type"),
-            "link_url": row.get("link_url"),
-        },
-        "page_categories": {
-            "page_entity_type": row.get("page_entity_type"),
-        },
-        "images": {
-            "original_image_url": row.get("original_image_url"),
-        },
-        "page_profile_picture_url": row.get("page_profile_picture_url"),
-        "page_profile_uri": row.get("page_profile_uri"),
-    }
-
-    return {
-        "ad_archive_id": row.get("ad_archive_id"),
-        "categories": row.get("categories"),
-        "collation_count": row.get("collation_count"),
-        "collation_id": row.get("collation_id"),
-        "start_date": row.get("start_date"),
-        "end_date": row.get("end_date"),
-        "entity_type": row.get("entity_type"),
-        "is_active": bool(row.get("is_active")),
-        "page_id": row.get("page_id"),
-        "page_name": row.get("page_name"),
-        "state_media_run_label": row.get("state_media_run_label"),
-        "total_active_time": row.get("total_active_time"),
-        "snapshot": snap,
-    }
+    return logic.AdItem.from_row(row)
 
 
 # =============================================================================
 # DETAIL VIEW — SAVED ADS
 # =============================================================================
-def render_saved_ad_detail(db_row: dict):
-    item_like = _db_row_to_item(db_row)
-    f = logic.extract_selected_fields(item_like)
+def render_saved_ad_detail(card: dict, db_row: dict):
+    _render_detail(card)
 
-    page_name = f.get("page_name") or "(no page name)"
-    ad_archive_id = f.get("ad_archive_id") or "–"
-
-    img_from_snapshot = f.get("original_image_url") or f.get("original_picture_url")
-    if img_from_snapshot:
-        media_type, media_url = "image", img_from_snapshot
+    idx, ad_id = card["idx"], card["ad_id"]
+    raw = db_row.get("raw_json")
+    if isinstance(raw, dict):
+        _lazy_json("All fields (raw JSON from DB)", raw, f"exp_raw_saved_{idx}_{ad_id}")
     else:
-        media_type, media_url = logic.extract_primary_media(item_like)
+        _lazy_json("DB row", db_row, f"exp_raw_saved_{idx}_{ad_id}")
 
-    st.markdown("---")
-    st.markdown(
-        f"<h3 style='margin-bottom:0;'>{page_name}</h3>"
-        f"<div style='color:#666;font-size:0.9rem;'>Ad Archive ID: {ad_archive_id}</div>",
-        unsafe_allow_html=True,
-    )
+    _lazy_json("Debug: Extracted fields", card["fields"]._asdict(), f"exp_fields_saved_{idx}_{ad_id}")
 
-    left, right = st.columns([3, 1], gap="large")
-    with left:
-        if media_url:
-            if media_type == "image":
-                st.image(media_url, use_column_width=True)
-            elif media_type == "video":
-                st.video(media_url)
-        if f.get("link_url"):
-            st.markdown(f"[Ad Destination URL]({f['link_url']})")
-        if f.get("page_profile_uri"):
-            st.markdown(f"[Page Profile]({f['page_profile_uri']})")
 
-    with right:
-        st.markdown("### Details")
-        info_rows = [
-            ("ad_archive_id", f.get("ad_archive_id")),
-            ("categories", f.get("categories")),
-            ("collation_count", f.get("collation_count")),
-            ("collation_id", f.get("collation_id")),
-            ("start_date", f.get("start_date")),
-            ("end_date", f.get("end_date")),
-            ("entity_type", f.get("entity_type")),
-            ("is_active", f.get("is_active")),
-            ("page_id", f.get("page_id")),
-            ("page_name", f.get("page_name")),
-            ("cta_text", f.get("cta_text")),
-            ("cta_type", f.get("cta_type")),
-            ("page_entity_type", f.get("page_entity_type")),
-            ("page_profile_picture_url", f.get("page_profile_picture_url")),
-            ("page_profile_uri", f.get("page_profile_uri")),
-            ("state_media_run_label", f.get("state_media_run_label")),
-            ("total_active_time", f.get("total_active_time")),
-            ("original_image_url", f.get("original_image_url")),
-        ]
-        st.markdown(_make_detail_table_html(info_rows), unsafe_allow_html=True)
+# =============================================================================
+# EXPORT BLOBS (cached per scrape run)
+# =============================================================================
+@st.cache_resource(show_spinner=False, ttl=60 * 60, max_entries=8)
+def _ads_df(run_id: str) -> pd.DataFrame:
+    # cache_resource: shared, not copied per rerun — callers must treat it as read-only
+    return logic.ads_to_dataframe(logic.db_fetch_scratch(run_id))
 
-    raw = db_row.get("raw_json")
-    if isinstance(raw, dict):
-        with st.expander("All fields (raw JSON from DB)"):
-            st.json(raw)
-    else:
-        with st.expander("DB row"):
-            st.json(db_row)
 
-    with st.expander("Debug: Extracted fields"):
-        st.json(f)
+@st.cache_data(show_spinner=False, max_entries=4)
+def _json_blob(run_id: str) -> bytes:
+    return orjson.dumps(logic.db_fetch_scratch(run_id), option=orjson.OPT_INDENT_2)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _csv_blob(run_id: str) -> bytes:
+    return _ads_df(run_id).to_csv(index=False).encode()
 
 
 # =============================================================================
 # MAIN SEARCH PAGE COMPOSER
 # =============================================================================
-def render_main_search_page(ads_items: list[dict], params: dict | None):
+def render_main_search_page(run_id: str | None, total: int, params: dict | None):
+    """
+    Render results of the current scrape. Items are read from the SQLite
+    scratch store (logic.db_fetch_scratch) one page at a time.
+    """
     if params:
         render_filter_bar(
             country_label=params.get("country_label", "US"),
@@ -451,52 +470,47 @@ def render_main_search_page(ads_items: list[dict], params: dict | None):
             unsafe_allow_html=True,
         )
 
-    if ads_items:
-        st.success(f"Retrieved {len(ads_items)} ads.")
+    if run_id and total:
+        st.success(f"Retrieved {total} ads.")
 
         # Export controls --------------------------------------------------
         exp_cols = st.columns(3)
         with exp_cols[0]:
             st.download_button(
                 label="Download JSON",
-                data=json.dumps(ads_items, indent=2, ensure_ascii=False),
+                data=partial(_json_blob, run_id),  # serialized on click, not every rerun
                 file_name="fb_ads_raw.json",
                 mime="application/json",
                 key="search_download_json",
             )
         with exp_cols[1]:
-            df = logic.ads_to_dataframe(ads_items)
             st.download_button(
                 label="Download CSV (curated)",
-                data=df.to_csv(index=False),
+                data=partial(_csv_blob, run_id),
                 file_name="fb_ads_curated.csv",
                 mime="text/csv",
                 key="search_download_csv",
             )
         with exp_cols[2]:
             with st.expander("Preview table (curated)"):
-                st.dataframe(df, use_container_width=True, key="search_preview_df")
+                st.dataframe(_ads_df(run_id), use_container_width=True, key="search_preview_df")
 
         # Cards -------------------------------------------------------------
-        cols_per_row = 3
-        for row_start in range(0, len(ads_items), cols_per_row):
-            cols = st.columns(cols_per_row, gap="large")
-            for i, col in enumerate(cols):
-                idx = row_start + i
-                if idx >= len(ads_items):
-                    continue
-                with col:
-                    render_ad_card(
-                        ads_items[idx],
-                        idx,
-                        variant="search",
-                        raw_item=ads_items[idx],  # for saving
-                    )
+        page = _page_selector(total, key="search_page")
+        offset = (page - 1) * PAGE_SIZE
+        cards = _prepare_cards(logic.db_fetch_scratch(run_id, PAGE_SIZE, offset), offset)
+
+        render_card_grid(cards, variant="search")
 
         # Detail panel ------------------------------------------------------
         sel_idx = st.session_state.get("selected_ad_idx")
-        if sel_idx is not None and 0 <= sel_idx < len(ads_items):
-            render_ad_detail(ads_items[sel_idx])
+        if sel_idx is not None and 0 <= sel_idx < total:
+            if offset <= sel_idx < offset + len(cards):
+                render_ad_detail(cards[sel_idx - offset])
+            else:
+                item = logic.db_get_scratch_item(run_id, sel_idx)
+                if item is not None:
+                    render_ad_detail(_prepare_card(item, sel_idx))
     else:
         st.info("Submit a query from the sidebar to fetch ads.")
 
@@ -504,32 +518,27 @@ def render_main_search_page(ads_items: list[dict], params: dict | None):
 # =============================================================================
 # SAVED ADS PAGE (load from DB + cards + detail)
 # =============================================================================
-def render_saved_ads_page(team: str, rows: list[dict]):
+def render_saved_ads_page(team: str, total: int):
     st.header(f"Saved Ads — {team}")
-    if not rows:
+    if not total:
         st.info("No ads saved yet.")
         return
 
-    items = [_db_row_to_item(r) for r in rows]
+    page = _page_selector(total, key=f"saved_page_{team}")
+    offset = (page - 1) * PAGE_SIZE
+    rows = logic.db_fetch_team(team, limit=PAGE_SIZE, offset=offset)
+    cards = _prepare_cards([_db_row_to_item(r) for r in rows], offset)
 
     # Card grid
-    cols_per_row = 3
-    for row_start in range(0, len(items), cols_per_row):
-        cols = st.columns(cols_per_row, gap="large")
-        for i, col in enumerate(cols):
-            idx = row_start + i
-            if idx >= len(items):
-                continue
-            with col:
-                render_ad_card(
-                    items[idx],
-                    idx,
-                    variant="saved",
-                    team=team,
-                )
+    render_card_grid(cards, variant="saved", team=team)
 
     # Detail panel
     sel_key = f"saved_selected_idx_{team}"
     sel_idx = st.session_state.get(sel_key)
-    if sel_idx is not None and 0 <= sel_idx < len(rows):
-        render_saved_ad_detail(rows[sel_idx])
+    if sel_idx is not None and 0 <= sel_idx < total:
+        if offset <= sel_idx < offset + len(rows):
+            render_saved_ad_detail(cards[sel_idx - offset], rows[sel_idx - offset])
+        else:
+            sel_rows = logic.db_fetch_team(team, limit=1, offset=sel_idx)
+            if sel_rows:
+                render_saved_ad_detail(_prepare_card(_db_row_to_item(sel_rows[0]), sel_idx), sel_rows[0])